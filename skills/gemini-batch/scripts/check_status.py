@@ -4,47 +4,80 @@
 Usage:
     python check_status.py <job_name>
     python check_status.py batches/abc123 --wait
+    python check_status.py batches/abc123 --wait --poll-cap 120
 
 Requirements:
     pip install google-genai
 """
 
 import argparse
+import functools
+import importlib.util
 import os
+import random
 import sys
 import time
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass
-
 
+@functools.cache
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client (created once per process).
+
+    Idle connections are kept alive between requests, so repeated calls
+    (uploads, status polls) reuse one TLS session instead of reconnecting.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
 
 
-def check_status(job_name: str, wait: bool = False) -> str:
+def check_status(
+    job_name: str,
+    wait: bool = False,
+    poll_initial: float = 2.0,
+    poll_cap: float = 60.0,
+) -> str:
     """Check batch job status.
 
+    While waiting, the poll interval starts at `poll_initial` and doubles
+    (plus up to 1s of jitter) while the state is unchanged, up to `poll_cap`.
+    It resets to `poll_initial` whenever the state changes.
+
     Args:
         job_name: The batch job name/ID
         wait: Whether to poll until completion
+        poll_initial: Initial poll interval in seconds
+        poll_cap: Maximum poll interval in seconds
 
     Returns:
         Final job state
@@ -67,15 +100,18 @@ def check_status(job_name: str, wait: bool = False) -> str:
 
     if wait:
         print(f"Polling status for job: {job_name}")
+        delay = poll_initial
         while state not in completed_states:
             print(f"Current state: {state}")
-            time.sleep(30)
+            time.sleep(delay + random.uniform(0, 1.0))
             batch_job = client.batches.get(name=job_name)
-            state = (
+            new_state = (
                 batch_job.state.name
                 if hasattr(batch_job.state, "name")
                 else str(batch_job.state)
             )
+            delay = poll_initial if new_state != state else min(poll_cap, delay * 2)
+            state = new_state
 
     if state == "JOB_STATE_SUCCEEDED":
         print("Job succeeded!")
@@ -96,13 +132,34 @@ def main():
         "--wait",
         "-w",
         action="store_true",
-        help="Wait for job to complete (polls every 30s)",
+        help="Wait for job to complete (polls with exponential backoff)",
+    )
+    parser.add_argument(
+        "--poll-initial",
+        type=float,
+        default=2.0,
+        help="Initial poll interval in seconds when waiting (default: 2)",
+    )
+    parser.add_argument(
+        "--poll-cap",
+        type=float,
+        default=60.0,
+        help="Maximum poll interval in seconds when waiting (default: 60)",
     )
 
     args = parser.parse_args()
+    if args.poll_initial <= 0:
+        parser.error("--poll-initial must be a positive number of seconds")
+    if args.poll_cap <= 0:
+        parser.error("--poll-cap must be a positive number of seconds")
 
     try:
-        check_status(job_name=args.job_name, wait=args.wait)
+        check_status(
+            job_name=args.job_name,
+            wait=args.wait,
+            poll_initial=args.poll_initial,
+            poll_cap=args.poll_cap,
+        )
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -11,50 +11,179 @@ Requirements:
 """
 
 import argparse
+import functools
+import importlib.util
 import os
 import sys
-from pathlib import Path
-
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass
 
 
+@functools.cache
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client (created once per process).
+
+    Idle connections are kept alive between requests, so repeated calls
+    (uploads, status polls) reuse one TLS session instead of reconnecting.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
+
+
+# Local record of uploaded input files, so unchanged files are not sent twice
+UPLOAD_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "gemini-batch", "uploads.sqlite"
+)
+# The File API deletes uploads after 48 hours; forget them a little earlier
+UPLOAD_CACHE_TTL = 47 * 3600
+
+
+def file_fingerprint(path: str) -> tuple[str, int, int]:
+    """Fingerprint a file by content, size and modification time.
+
+    Returns:
+        Tuple of (sha256 hex digest, size in bytes, mtime in nanoseconds)
+    """
+    import hashlib
+
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            digest = hashlib.file_digest(f, "sha256")
+        else:
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest(), stat.st_size, stat.st_mtime_ns
+
+
+def open_upload_cache(path: str = UPLOAD_CACHE_PATH):
+    """Open (creating if needed) the upload cache database.
+
+    Returns:
+        sqlite3 connection, or None if the cache cannot be opened
+    """
+    import sqlite3
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            "sha TEXT, size INTEGER, mtime INTEGER, mime_type TEXT, "
+            "remote_name TEXT, expires_at REAL, "
+            "PRIMARY KEY (sha, size, mtime, mime_type))"
+        )
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: upload cache disabled ({e})", file=sys.stderr)
+        return None
+
+
+def find_cached_upload(client, conn, fingerprint: tuple, mime_type: str):
+    """Look up a previous upload of the same file.
+
+    The remote file is fetched to confirm it still exists, has not failed
+    processing and has the expected MIME type; stale entries are dropped.
+
+    Returns:
+        The remote File object, or None on a miss
+    """
+    import time
+
+    from google.genai import errors
+
+    key = (*fingerprint, mime_type)
+    row = conn.execute(
+        "SELECT remote_name FROM uploads WHERE sha = ? AND size = ? AND mtime = ? "
+        "AND mime_type = ? AND expires_at > ?",
+        (*key, time.time()),
+    ).fetchone()
+    if row is None:
+        return None
+
+    try:
+        remote = client.files.get(name=row[0])
+    except errors.APIError:
+        remote = None
+    # The API may report "jsonl" back as "application/jsonl"
+    if (
+        remote is None
+        or remote.state == "FAILED"
+        or not (remote.mime_type or "").endswith(mime_type)
+    ):
+        conn.execute(
+            "DELETE FROM uploads WHERE sha = ? AND size = ? AND mtime = ? "
+            "AND mime_type = ?",
+            key,
+        )
+        conn.commit()
+        return None
+    return remote
+
+
+def record_upload(conn, fingerprint: tuple, mime_type: str, remote_name: str) -> None:
+    """Remember an upload in the upload cache."""
+    import time
+
+    conn.execute(
+        "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+        (*fingerprint, mime_type, remote_name, time.time() + UPLOAD_CACHE_TTL),
+    )
+    conn.commit()
 
 
 def create_batch_job(
     input_file: str,
     model: str = "gemini-3-flash-preview",
     display_name: str | None = None,
+    use_cache: bool = True,
 ) -> str:
     """Create a batch job from a JSONL file.
 
+    If the same input file (matched by SHA-256, size and mtime) was uploaded
+    earlier and is still stored, that upload is reused.
+
     Args:
         input_file: Path to JSONL file with requests
         model: Model ID to use
         display_name: Optional display name for the job
+        use_cache: Reuse an earlier upload if the input file is unchanged
 
     Returns:
         Job name/ID
     """
+    from pathlib import Path
+
     from google.genai import types
 
     client = get_client()
@@ -64,16 +193,29 @@ def create_batch_job(
         print(f"Error: File not found: {input_file}")
         sys.exit(1)
 
-    print(f"Uploading batch input file: {input_file}...")
+    uploaded_file = None
+    cache = open_upload_cache() if use_cache else None
+    if cache:
+        fingerprint = file_fingerprint(input_file)
+        uploaded_file = find_cached_upload(client, cache, fingerprint, "jsonl")
 
-    uploaded_file = client.files.upload(
-        file=input_file,
-        config=types.UploadFileConfig(
-            display_name=display_name or file_path.stem, mime_type="jsonl"
-        ),
-    )
+    if uploaded_file:
+        print(f"Reusing uploaded input file: {uploaded_file.name}")
+    else:
+        print(f"Uploading batch input file: {input_file}...")
+
+        uploaded_file = client.files.upload(
+            file=input_file,
+            config=types.UploadFileConfig(
+                display_name=display_name or file_path.stem, mime_type="jsonl"
+            ),
+        )
 
-    print(f"File uploaded: {uploaded_file.name}")
+        print(f"File uploaded: {uploaded_file.name}")
+        if cache:
+            record_upload(cache, fingerprint, "jsonl", uploaded_file.name)
+    if cache:
+        cache.close()
 
     batch_job = client.batches.create(
         model=model,
@@ -97,6 +239,11 @@ def main():
         help="Model ID (default: gemini-3-flash-preview)",
     )
     parser.add_argument("--name", "-n", help="Display name for the batch job")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always upload the input file, even if it was uploaded earlier",
+    )
 
     args = parser.parse_args()
 
@@ -105,6 +252,7 @@ def main():
             input_file=args.input_file,
             model=args.model,
             display_name=args.name,
+            use_cache=not args.no_cache,
         )
         print(f"\nJob name: {job_name}")
         print("Use check_status.py to monitor progress")
@@ -10,41 +10,88 @@ Requirements:
 """
 
 import argparse
+import functools
+import importlib.util
+import io
 import json
 import os
 import sys
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass
-
 
+@functools.cache
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client (created once per process).
+
+    Idle connections are kept alive between requests, so repeated calls
+    (uploads, status polls) reuse one TLS session instead of reconnecting.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
 
 
-def get_results(job_name: str, output: str | None = None) -> str | None:
+def response_preview(response: dict, dumps, limit: int = 200) -> str:
+    """Return the first `limit` characters of a batch response.
+
+    Text is taken from `candidates[0].content.parts`, as returned by
+    generateContent. Any other response (e.g. structured output without
+    text parts) is previewed as compact JSON instead of its Python repr.
+    """
+    text = response.get("text")
+    if text is None:
+        candidates = response.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        text = "".join(part.get("text", "") for part in parts) or None
+    if text is None:
+        text = dumps(response)
+        if isinstance(text, bytes):
+            text = text[:limit].decode("utf-8", "replace")
+    return text[:limit]
+
+
+def get_results(
+    job_name: str, output: str | None = None, decode: bool = True
+) -> str | bytes | None:
     """Retrieve batch job results.
 
+    Results are printed line by line from the downloaded bytes, and saved to
+    `output` as downloaded, without a decode/encode round trip.
+
     Args:
         job_name: The batch job name/ID
         output: Optional output file path
+        decode: Return the results as text; if False, return the downloaded
+            bytes without decoding them
 
     Returns:
         Results content or None
@@ -70,26 +117,38 @@ def get_results(job_name: str, output: str | None = None) -> str | None:
         result_file_name = batch_job.dest.file_name
         print(f"Downloading results from: {result_file_name}")
 
-        file_content = client.files.download(file=result_file_name)
-        content = file_content.decode("utf-8")
+        content = client.files.download(file=result_file_name)
 
         if output:
-            with open(output, "w", encoding="utf-8") as f:
+            with open(output, "wb") as f:
                 f.write(content)
             print(f"Results saved to {output}")
-        else:
-            print("Results:")
-            for line in content.strip().split("\n"):
-                try:
-                    result = json.loads(line)
-                    print(f"  Key: {result.get('key', 'N/A')}")
-                    if "response" in result:
-                        text = result["response"].get("text", str(result["response"]))
-                        print(f"  Response: {text[:200]}...")
-                except json.JSONDecodeError:
-                    print(f"  {line[:200]}...")
-
-        return content
+            return content.decode("utf-8") if decode else content
+
+        # orjson is optional but parses large results several times faster;
+        # both parsers accept the raw bytes lines directly
+        try:
+            from orjson import dumps, loads
+        except ImportError:
+            dumps, loads = json.dumps, json.loads
+        get = dict.get
+
+        print("Results:")
+        for raw_line in io.BytesIO(content):
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                result = loads(line)
+            except ValueError:
+                print(f"  {line[:200].decode('utf-8', 'replace')}...")
+                continue
+            print(f"  Key: {get(result, 'key', 'N/A')}")
+            response = get(result, "response")
+            if response is not None:
+                print(f"  Response: {response_preview(response, dumps)}...")
+
+        return content.decode("utf-8") if decode else content
 
     elif batch_job.dest and hasattr(batch_job.dest, "inlined_responses"):
         print("Inline Results:")
@@ -115,7 +174,8 @@ def main():
     args = parser.parse_args()
 
     try:
-        get_results(job_name=args.job_name, output=args.output)
+        # The CLI only prints and saves results, so skip decoding them
+        get_results(job_name=args.job_name, output=args.output, decode=False)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -6,38 +6,392 @@ Usage:
     python embed.py "Search query" --task RETRIEVAL_QUERY
     python embed.py "Document text" --task RETRIEVAL_DOCUMENT --dim 768
     python embed.py "Text 1" "Text 2" "Text 3" --similarity
+    python embed.py "Text 1" "Text 2" "Text 3" --topk 1
+    python embed.py "Text 1" "Text 2" "Text 3" --concurrency 16
+    python embed.py "Fresh text" --no-cache
+    python embed.py "search query" --task RETRIEVAL_QUERY --normalized-cache
+    python embed.py "Text 1" "Text 2" --daemon
+    python embed.py "Text 1" "Text 2" "Text 3" --fast-loop
 
 Requirements:
     pip install google-genai numpy
 """
 
 import argparse
+import hashlib
+import importlib.util
+import math
 import os
+import re
+import sqlite3
+import struct
 import sys
+from array import array
+from pathlib import Path
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
+# Maximum number of texts the API accepts in a single embed request
+MAX_BATCH_SIZE = 100
 
-    load_dotenv()
-except ImportError:
-    pass
+# Persistent cache of previously computed embeddings
+CACHE_PATH = Path.home() / ".cache" / "gemini-embeddings" / "cache.sqlite"
+
+# Optional background process that keeps the client and its connections
+# alive between invocations (see --daemon); it exits after being idle
+DAEMON_SOCKET = Path.home() / ".cache" / "gemini-cli" / "daemon.sock"
+DAEMON_IDLE_TIMEOUT = 300
+
+# gemini-embedding models are Matryoshka-trained: a prefix of the full
+# vector, renormalized, is the embedding at the smaller dimension
+FULL_DIM = 3072
+MATRYOSHKA_DIMS = (768, 1536)
 
 
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client.
+
+    Idle connections are kept alive, and concurrent requests share HTTP/2
+    connections when the optional h2 package is installed.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
+
+
+def run_async(coro, fast_loop: bool = False):
+    """Run a coroutine to completion.
+
+    With `fast_loop`, the coroutine runs on uvloop if it is installed,
+    which handles many concurrent sockets faster than the default loop.
+    """
+    import asyncio
+
+    if fast_loop:
+        try:
+            import uvloop
+        except ImportError:
+            print(
+                "Warning: uvloop not installed, using asyncio. Run: pip install uvloop",
+                file=sys.stderr,
+            )
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def open_cache(path: Path = CACHE_PATH) -> sqlite3.Connection | None:
+    """Open the local embedding cache, creating it if needed.
+
+    Returns None if the cache cannot be opened; embedding then proceeds
+    without caching.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        # WAL lets concurrent shell invocations read while another one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, dim INTEGER, vec BLOB)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS normalized "
+            "(norm_key TEXT PRIMARY KEY, key TEXT)"
+        )
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Embedding cache disabled: {e}", file=sys.stderr)
+        return None
+    return conn
+
+
+def cache_key(model: str, task_type: str, output_dim: int | None, text: str) -> str:
+    """Build the cache key for a text embedded with the given settings."""
+    return hashlib.sha256(
+        f"{model}|{task_type}|{output_dim}|{text}".encode()
+    ).hexdigest()
+
+
+def cache_lookup(
+    conn: sqlite3.Connection, keys: list[str], full_precision: bool = False
+) -> dict[str, list[float]]:
+    """Return cached embeddings for the given keys.
+
+    Rows may hold float16 or float32 vectors. With `full_precision`, only
+    float32 rows count as hits.
+    """
+    found = {}
+    # Stay below SQLite's limit on bound parameters per statement
+    for i in range(0, len(keys), 500):
+        chunk = keys[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT key, dim, vec FROM embeddings WHERE key IN ({placeholders})",
+            chunk,
+        )
+        for key, dim, blob in rows:
+            if len(blob) == 2 * dim:
+                if not full_precision:
+                    found[key] = list(struct.unpack(f"<{dim}e", blob))
+            else:
+                vec = array("f")
+                vec.frombytes(blob)
+                found[key] = vec.tolist()
+    return found
+
+
+def cache_store(
+    conn: sqlite3.Connection,
+    entries: dict[str, list[float]],
+    full_precision: bool = False,
+) -> None:
+    """Store embeddings as float16 blobs, or float32 with `full_precision`.
+
+    float16 keeps cosine similarities within about 1e-3 of the float32
+    values at half the storage.
+    """
+
+    def encode(values: list[float]) -> bytes:
+        if full_precision:
+            return array("f", values).tobytes()
+        return struct.pack(f"<{len(values)}e", *values)
+
+    with conn:
+        # REPLACE lets a full-precision run upgrade an existing float16 row
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, dim, vec) VALUES (?, ?, ?)",
+            [(key, len(values), encode(values)) for key, values in entries.items()],
+        )
+
+
+def truncate_embedding(values: list[float], dim: int) -> list[float]:
+    """Truncate a Matryoshka embedding to `dim` values and renormalize it."""
+    head = values[:dim]
+    norm = math.hypot(*head)
+    return [value / norm for value in head] if norm else head
+
+
+def require_numpy():
+    """Import numpy or exit with an install hint."""
+    try:
+        import numpy as np
+    except ImportError:
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    return np
+
+
+def normalized_key(scope: str, text: str) -> str:
+    """Build a key that ignores case, whitespace, and punctuation in a text.
+
+    Only those differences are ignored: any change to the words, however
+    small, gives a different key, since it may change the meaning.
+    """
+    words = re.findall(r"\w+", text.lower())
+    return hashlib.sha256(f"{scope}|{' '.join(words)}".encode()).hexdigest()
+
+
+def normalized_lookup(
+    conn: sqlite3.Connection,
+    scope: str,
+    misses: dict[str, str],
+    full_precision: bool = False,
+) -> dict[str, list[float]]:
+    """Find cached embeddings of texts that match after normalization.
+
+    Args:
+        conn: Open cache connection
+        scope: Embedding settings the match must share (model, task, dim)
+        misses: Mapping of cache key to text for texts not in the exact cache
+        full_precision: Only accept matches cached as float32
+
+    Returns:
+        Mapping of cache key to the embedding of its matching cached text
+    """
+    norm_keys = {key: normalized_key(scope, text) for key, text in misses.items()}
+    matches = {}
+    values = list(set(norm_keys.values()))
+    # Stay below SQLite's limit on bound parameters per statement
+    for i in range(0, len(values), 500):
+        chunk = values[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        matches.update(
+            conn.execute(
+                f"SELECT norm_key, key FROM normalized WHERE norm_key IN ({placeholders})",
+                chunk,
+            )
+        )
+
+    vectors = cache_lookup(conn, list(set(matches.values())), full_precision)
+    return {
+        key: vectors[matches[norm_key]]
+        for key, norm_key in norm_keys.items()
+        if matches.get(norm_key) in vectors
+    }
+
+
+def store_normalized(
+    conn: sqlite3.Connection, scope: str, texts: dict[str, str]
+) -> None:
+    """Record newly embedded texts for normalized-text lookup."""
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO normalized (norm_key, key) VALUES (?, ?)",
+            [(normalized_key(scope, text), key) for key, text in texts.items()],
+        )
+
+
+async def generate_embeddings_async(
+    texts: list[str],
+    model: str = "gemini-embedding-001",
+    task_type: str = "SEMANTIC_SIMILARITY",
+    output_dim: int | None = None,
+    concurrency: int = 8,
+    use_cache: bool = True,
+    normalized_cache: bool = False,
+    full_precision: bool = False,
+    client=None,
+) -> list[list[float]]:
+    """Generate embeddings for texts using concurrent requests.
+
+    Texts already in the local cache are served from it. With
+    `normalized_cache`, texts that differ from a cached text only in case,
+    whitespace, and punctuation reuse that text's embedding.
+
+    The rest are split into micro-batches of up to MAX_BATCH_SIZE and sent
+    through the async client, with at most `concurrency` requests in
+    flight.
+
+    768- and 1536-dimensional embeddings from gemini-embedding models are
+    renormalized to unit length, as the full 3072-dimensional ones already
+    are. With the cache enabled, they are cut from the cached full vector,
+    so one API call serves every dimension of a text.
+
+    Args:
+        texts: List of texts to embed
+        model: Embedding model ID
+        task_type: Task type for optimization
+        output_dim: Output dimensionality (768, 1536, or 3072)
+        concurrency: Maximum number of concurrent requests
+        use_cache: Read and write the local embedding cache
+        normalized_cache: Reuse embeddings of cached texts that differ only
+            in case, whitespace, and punctuation
+        full_precision: Cache embeddings as float32 instead of float16
+        client: Client to reuse (default: a new one from get_client, closed
+            before returning)
+
+    Returns:
+        List of embedding vectors, in input order
+    """
+    truncate_to = None
+    if output_dim in MATRYOSHKA_DIMS and model.startswith("gemini-embedding"):
+        truncate_to = output_dim
+        if use_cache:
+            output_dim = FULL_DIM
+
+    keys = [cache_key(model, task_type, output_dim, text) for text in texts]
+
+    conn = open_cache() if use_cache else None
+    found = cache_lookup(conn, keys, full_precision) if conn else {}
+
+    # Embed each distinct uncached text once
+    misses = {
+        key: text for key, text in zip(keys, texts, strict=True) if key not in found
+    }
+
+    scope = f"{model}|{task_type}|{output_dim}"
+    if conn and normalized_cache and misses:
+        # Matches serve this call only; the exact cache keeps real embeddings
+        near = normalized_lookup(conn, scope, misses, full_precision)
+        found.update(near)
+        misses = {key: text for key, text in misses.items() if key not in near}
+
+    if misses:
+        import asyncio
+
+        from google.genai import types
+
+        own_client = client is None
+        if own_client:
+            client = get_client()
+
+        config = types.EmbedContentConfig(task_type=task_type)
+        if output_dim:
+            config.output_dimensionality = output_dim
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed_batch(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                response = await client.aio.models.embed_content(
+                    model=model,
+                    contents=batch,
+                    config=config,
+                )
+            return [e.values for e in response.embeddings]
+
+        miss_keys = list(misses)
+        miss_texts = list(misses.values())
+        batches = [
+            miss_texts[i : i + MAX_BATCH_SIZE]
+            for i in range(0, len(miss_texts), MAX_BATCH_SIZE)
+        ]
+        try:
+            results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        finally:
+            if own_client:
+                # Async connections are bound to this event loop, so close
+                # them in it
+                await client.aio.aclose()
+                client.close()
+
+        computed = dict(
+            zip(
+                miss_keys,
+                (values for batch in results for values in batch),
+                strict=True,
+            )
+        )
+        if conn:
+            cache_store(conn, computed, full_precision)
+            if normalized_cache:
+                store_normalized(conn, scope, misses)
+        found.update(computed)
+
+    if conn:
+        conn.close()
+
+    if truncate_to:
+        return [truncate_embedding(found[key], truncate_to) for key in keys]
+    return [found[key] for key in keys]
 
 
 def generate_embeddings(
@@ -45,6 +399,11 @@ def generate_embeddings(
     model: str = "gemini-embedding-001",
     task_type: str = "SEMANTIC_SIMILARITY",
     output_dim: int | None = None,
+    concurrency: int = 8,
+    use_cache: bool = True,
+    normalized_cache: bool = False,
+    full_precision: bool = False,
+    fast_loop: bool = False,
 ) -> list[list[float]]:
     """Generate embeddings for texts.
 
@@ -53,55 +412,227 @@ def generate_embeddings(
         model: Embedding model ID
         task_type: Task type for optimization
         output_dim: Output dimensionality (768, 1536, or 3072)
+        concurrency: Maximum number of concurrent requests
+        use_cache: Read and write the local embedding cache
+        normalized_cache: Reuse embeddings of cached texts that differ only
+            in case, whitespace, and punctuation
+        full_precision: Cache embeddings as float32 instead of float16
+        fast_loop: Run on uvloop if it is installed
 
     Returns:
         List of embedding vectors
     """
-    from google.genai import types
+    return run_async(
+        generate_embeddings_async(
+            texts=texts,
+            model=model,
+            task_type=task_type,
+            output_dim=output_dim,
+            concurrency=concurrency,
+            use_cache=use_cache,
+            normalized_cache=normalized_cache,
+            full_precision=full_precision,
+        ),
+        fast_loop=fast_loop,
+    )
 
-    client = get_client()
 
-    config = types.EmbedContentConfig(task_type=task_type)
-    if output_dim:
-        config.output_dimensionality = output_dim
+def daemon_request(options: dict) -> dict | None:
+    """Run an embedding request through the background daemon.
+
+    Starts the daemon if it is not running. The first request is then
+    served in-process while the daemon starts up.
+
+    Args:
+        options: Keyword arguments for generate_embeddings
 
-    response = client.models.embed_content(
-        model=model,
-        contents=texts if len(texts) > 1 else texts[0],
-        config=config,
+    Returns:
+        The daemon's response, or None if the caller should embed in-process
+    """
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(DAEMON_SOCKET))
+        except OSError:
+            start_daemon()
+            return None
+        try:
+            sock.sendall(json.dumps(options).encode())
+            # End of input marks the end of the request
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as f:
+                reply = f.read()
+            # An empty reply means the daemon could not handle the request
+            return json.loads(reply) if reply else None
+        except (OSError, ValueError):
+            return None
+
+
+def start_daemon() -> None:
+    """Start the embedding daemon as a detached background process."""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
     )
 
-    return [e.values for e in response.embeddings]
+
+async def serve_daemon(idle_timeout: float = DAEMON_IDLE_TIMEOUT) -> None:
+    """Serve embedding requests on DAEMON_SOCKET until idle for a while.
+
+    Each connection carries one JSON object of generate_embeddings
+    arguments, ended by closing the write side, and receives one JSON
+    object back, with either "embeddings" or "error". A request that cannot
+    be read gets no reply. All requests share one client, so connections to
+    the API stay warm.
+    """
+    import asyncio
+    import json
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        if sock.connect_ex(str(DAEMON_SOCKET)) == 0:
+            return  # another daemon is already serving
+
+    loop = asyncio.get_running_loop()
+    client = get_client()
+    active = 0
+    last_used = loop.time()
+
+    async def handle(reader, writer) -> None:
+        nonlocal active, last_used
+        active += 1
+        last_used = loop.time()
+        try:
+            # Read to end of input: requests of many long documents easily
+            # exceed the stream reader's line limit
+            try:
+                options = json.loads(await reader.read())
+            except (OSError, ValueError):
+                return
+            try:
+                embeddings = await generate_embeddings_async(**options, client=client)
+                response = {"embeddings": embeddings}
+            except (Exception, SystemExit) as e:
+                response = {"error": str(e) or type(e).__name__}
+            writer.write(json.dumps(response).encode())
+            await writer.drain()
+        finally:
+            writer.close()
+            active -= 1
+            last_used = loop.time()
+
+    DAEMON_SOCKET.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    DAEMON_SOCKET.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(handle, path=str(DAEMON_SOCKET))
+    os.chmod(DAEMON_SOCKET, 0o600)
+    try:
+        while active or loop.time() - last_used < idle_timeout:
+            await asyncio.sleep(max(idle_timeout - (loop.time() - last_used), 1))
+    finally:
+        server.close()
+        DAEMON_SOCKET.unlink(missing_ok=True)
+        await client.aio.aclose()
+        client.close()
+
+
+def embeddings_json(embeddings: list[list[float]], full_precision: bool = False) -> str:
+    """Serialize embeddings as a JSON array of arrays.
+
+    Values are written with 4 significant digits, about the precision of
+    float16, which roughly halves the output size. `full_precision` keeps
+    every float32 digit.
+    """
+    if full_precision:
+        import json
+
+        return json.dumps(embeddings)
+    return (
+        "["
+        + ",".join(
+            "[" + ",".join(f"{value:.4g}" for value in emb) + "]" for emb in embeddings
+        )
+        + "]"
+    )
 
 
 def calculate_similarity(embeddings: list[list[float]]) -> list[tuple[int, int, float]]:
     """Calculate pairwise cosine similarity."""
-    try:
-        import numpy as np
-    except ImportError:
-        print("Error: numpy not installed. Run: pip install numpy")
-        sys.exit(1)
+    np = require_numpy()
 
-    embeddings_array = np.array(embeddings)
+    # float32 halves memory traffic versus float64 for large inputs
+    embeddings_array = np.asarray(embeddings, dtype=np.float32)
 
     # Normalize
     norms = np.linalg.norm(embeddings_array, axis=1, keepdims=True)
     normalized = embeddings_array / norms
 
     # Calculate similarity matrix
-    similarity_matrix = np.dot(normalized, normalized.T)
+    similarity_matrix = normalized @ normalized.T
+
+    # Extract upper-triangle pairs without a Python-level loop
+    rows, cols = np.triu_indices(len(embeddings), k=1)
+    sims = similarity_matrix[rows, cols]
 
-    # Extract pairs
-    pairs = []
-    n = len(embeddings)
-    for i in range(n):
-        for j in range(i + 1, n):
-            pairs.append((i, j, float(similarity_matrix[i, j])))
+    return list(zip(rows.tolist(), cols.tolist(), sims.tolist(), strict=True))
 
-    return pairs
+
+def nearest_neighbors(
+    embeddings: list[list[float]], k: int
+) -> list[list[tuple[int, float]]]:
+    """Find the k most similar other texts for each embedding.
+
+    Uses an exact FAISS inner-product index over normalized vectors, which
+    needs O(n * dim) memory instead of the O(n^2) full similarity matrix.
+
+    Returns:
+        For each embedding, a list of (index, similarity) pairs, best first
+    """
+    np = require_numpy()
+    try:
+        import faiss
+    except ImportError:
+        print("Error: faiss not installed. Run: pip install faiss-cpu")
+        sys.exit(1)
+
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    if faiss.get_num_gpus() > 0:
+        index = faiss.index_cpu_to_gpu(faiss.StandardGpuResources(), 0, index)
+    index.add(vectors)
+
+    k = min(k, len(embeddings) - 1)
+    # Ask for one extra result to make room for each vector's self-match
+    sims, ids = index.search(vectors, k + 1)
+
+    return [
+        [
+            (j, sim)
+            for j, sim in zip(row_ids.tolist(), row_sims.tolist(), strict=True)
+            if j != i and j != -1
+        ][:k]
+        for i, (row_ids, row_sims) in enumerate(zip(ids, sims, strict=True))
+    ]
 
 
 def main():
+    if sys.argv[1:] == ["--serve-daemon"]:
+        import asyncio
+
+        asyncio.run(serve_daemon())
+        return
+
     parser = argparse.ArgumentParser(
         description="Generate text embeddings using Gemini API"
     )
@@ -138,24 +669,84 @@ def main():
         action="store_true",
         help="Calculate pairwise similarity (requires multiple texts)",
     )
+    parser.add_argument(
+        "--topk",
+        "-k",
+        type=int,
+        help="Show the K most similar texts for each text (requires faiss)",
+    )
     parser.add_argument(
         "--json", "-j", action="store_true", help="Output embeddings as JSON"
     )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=8,
+        help="Maximum concurrent requests for multi-batch input (default: 8)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local embedding cache (~/.cache/gemini-embeddings/)",
+    )
+    parser.add_argument(
+        "--normalized-cache",
+        action="store_true",
+        help="Reuse cached embeddings of texts that differ only in case, "
+        "whitespace, and punctuation",
+    )
+    parser.add_argument(
+        "--full-precision",
+        action="store_true",
+        help="Cache and output float32 values instead of float16 precision",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Embed through a background process that keeps the client warm "
+        "between invocations (started on first use, exits when idle)",
+    )
+    parser.add_argument(
+        "--fast-loop",
+        action="store_true",
+        help="Run requests on uvloop (requires: pip install uvloop)",
+    )
 
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.topk is not None and args.topk < 1:
+        parser.error("--topk must be at least 1")
 
     try:
-        embeddings = generate_embeddings(
-            texts=args.texts,
-            model=args.model,
-            task_type=args.task,
-            output_dim=args.dim,
-        )
+        options = {
+            "texts": args.texts,
+            "model": args.model,
+            "task_type": args.task,
+            "output_dim": args.dim,
+            "concurrency": args.concurrency,
+            "use_cache": not args.no_cache,
+            "normalized_cache": args.normalized_cache,
+            "full_precision": args.full_precision,
+        }
+        response = daemon_request(options) if args.daemon else None
+        if response is None:
+            embeddings = generate_embeddings(**options, fast_loop=args.fast_loop)
+        elif "error" in response:
+            raise RuntimeError(response["error"])
+        else:
+            embeddings = response["embeddings"]
 
         if args.json:
-            import json
-
-            print(json.dumps(embeddings))
+            print(embeddings_json(embeddings, args.full_precision))
+        elif args.topk and len(args.texts) > 1:
+            neighbors = nearest_neighbors(embeddings, args.topk)
+            print(f"Top {args.topk} Similar:")
+            for i, matches in enumerate(neighbors):
+                print(f"  '{args.texts[i][:30]}...'")
+                for j, sim in matches:
+                    print(f"    -> '{args.texts[j][:30]}...': {sim:.4f}")
         elif args.similarity and len(args.texts) > 1:
             pairs = calculate_similarity(embeddings)
             print("Pairwise Similarity:")
@@ -5,40 +5,59 @@ Usage:
     python upload.py image.jpg
     python upload.py document.pdf --name "my-document"
     python upload.py video.mp4 --wait
+    python upload.py photos/*.jpg
+    python upload.py photos/*.jpg --fast-loop
 
 Requirements:
     pip install google-genai
 """
 
 import argparse
+import importlib.util
 import os
 import sys
-import time
-from pathlib import Path
-
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client.
+
+    Idle connections are kept alive between requests, so repeated calls
+    (uploads, status polls) reuse one TLS session instead of reconnecting.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
 
 
 MIME_TYPES = {
@@ -59,85 +78,341 @@ MIME_TYPES = {
 }
 
 
-def upload_file(
-    path: str,
+def run_async(coro, fast_loop: bool = False):
+    """Run a coroutine to completion.
+
+    With `fast_loop`, the coroutine runs on uvloop if it is installed,
+    which handles many concurrent sockets faster than the default loop.
+    """
+    import asyncio
+
+    if fast_loop:
+        try:
+            import uvloop
+        except ImportError:
+            print(
+                "Warning: uvloop not installed, using asyncio. Run: pip install uvloop",
+                file=sys.stderr,
+            )
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+# Maximum number of uploads in flight at once
+MAX_CONCURRENT_UPLOADS = 8
+
+# Local record of uploaded files, so unchanged files are not sent twice
+UPLOAD_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "gemini-files", "uploads.sqlite"
+)
+# The File API deletes uploads after 48 hours; forget them a little earlier
+UPLOAD_CACHE_TTL = 47 * 3600
+
+
+def file_fingerprint(path: str) -> tuple[str, int, int]:
+    """Fingerprint a file by content, size and modification time.
+
+    Returns:
+        Tuple of (sha256 hex digest, size in bytes, mtime in nanoseconds)
+    """
+    import hashlib
+
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            digest = hashlib.file_digest(f, "sha256")
+        else:
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest(), stat.st_size, stat.st_mtime_ns
+
+
+def open_upload_cache(path: str = UPLOAD_CACHE_PATH):
+    """Open (creating if needed) the upload cache database.
+
+    Returns:
+        sqlite3 connection, or None if the cache cannot be opened
+    """
+    import sqlite3
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            "sha TEXT, size INTEGER, mtime INTEGER, mime_type TEXT, "
+            "remote_name TEXT, expires_at REAL, "
+            "PRIMARY KEY (sha, size, mtime, mime_type))"
+        )
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: upload cache disabled ({e})", file=sys.stderr)
+        return None
+
+
+async def find_cached_upload(client, conn, fingerprint: tuple, mime_type: str):
+    """Look up a previous upload of the same file.
+
+    The remote file is fetched to confirm it still exists, has not failed
+    processing and has the expected MIME type; stale entries are dropped.
+
+    Returns:
+        The remote File object, or None on a miss
+    """
+    import time
+
+    from google.genai import errors
+
+    key = (*fingerprint, mime_type)
+    row = conn.execute(
+        "SELECT remote_name FROM uploads WHERE sha = ? AND size = ? AND mtime = ? "
+        "AND mime_type = ? AND expires_at > ?",
+        (*key, time.time()),
+    ).fetchone()
+    if row is None:
+        return None
+
+    try:
+        remote = await client.aio.files.get(name=row[0])
+    except errors.APIError:
+        remote = None
+    if remote is None or remote.state == "FAILED" or remote.mime_type != mime_type:
+        conn.execute(
+            "DELETE FROM uploads WHERE sha = ? AND size = ? AND mtime = ? "
+            "AND mime_type = ?",
+            key,
+        )
+        conn.commit()
+        return None
+    return remote
+
+
+def record_upload(conn, fingerprint: tuple, mime_type: str, remote_name: str) -> None:
+    """Remember an upload in the upload cache."""
+    import time
+
+    conn.execute(
+        "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+        (*fingerprint, mime_type, remote_name, time.time() + UPLOAD_CACHE_TTL),
+    )
+    conn.commit()
+
+
+async def wait_active(client, name: str) -> AsyncIterator[str]:
+    """Poll an uploaded file until processing finishes.
+
+    Polls back off from 2s to 4s and 8s, then every 15s.
+
+    Yields:
+        Each observed state, ending with ACTIVE or FAILED
+    """
+    import asyncio
+
+    delay = 2
+    while True:
+        file_info = await client.aio.files.get(name=name)
+        yield file_info.state
+        if file_info.state in ("ACTIVE", "FAILED"):
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 15)
+
+
+async def upload_files_async(
+    paths: list[str],
     display_name: str | None = None,
     wait: bool = False,
-) -> dict:
-    """Upload a file to Gemini File API.
+    on_ready: Callable[[dict], Awaitable[None]] | None = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """Upload files to Gemini File API concurrently.
+
+    All uploads share one client and connection pool, with at most
+    MAX_CONCURRENT_UPLOADS in flight. The SDK sends each file in chunks
+    through a resumable upload, so large media is never read into memory
+    as a whole. Files already uploaded with identical content (matched by
+    SHA-256, size and mtime) are reused instead of being sent again.
 
     Args:
-        path: Path to the file
-        display_name: Optional display name
+        paths: Paths to the files
+        display_name: Optional display name (applied to every file)
         wait: Wait for processing to complete
+        on_ready: Optional coroutine function called with each file's info
+            as soon as it is ACTIVE, while other files are still uploading
+        use_cache: Reuse earlier uploads of unchanged files
 
     Returns:
-        File info dict
+        File info dicts, in input order
     """
+    import asyncio
+    from pathlib import Path
+
     from google.genai import types
 
+    for path in paths:
+        if not Path(path).exists():
+            print(f"Error: File not found: {path}")
+            sys.exit(1)
+
     client = get_client()
+    cache = open_upload_cache() if use_cache else None
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+    ready_tasks = []
 
-    file_path = Path(path)
-    if not file_path.exists():
-        print(f"Error: File not found: {path}")
-        sys.exit(1)
+    async def upload_one(path: str) -> dict:
+        file_path = Path(path)
+        mime_type = MIME_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+
+        uploaded_file = None
+        if cache:
+            fingerprint = await asyncio.to_thread(file_fingerprint, path)
+            uploaded_file = await find_cached_upload(
+                client, cache, fingerprint, mime_type
+            )
+
+        if uploaded_file:
+            print(f"Reusing earlier upload of {path}")
+        else:
+            async with semaphore:
+                print(f"Uploading {path}...")
+                uploaded_file = await client.aio.files.upload(
+                    file=path,
+                    config=types.UploadFileConfig(
+                        mime_type=mime_type,
+                        display_name=display_name or file_path.name,
+                    ),
+                )
+            if cache:
+                record_upload(cache, fingerprint, mime_type, uploaded_file.name)
+
+        print(f"Uploaded: {uploaded_file.name}")
+        print(f"URI: {uploaded_file.uri}")
+        print(f"State: {uploaded_file.state}")
+
+        state = uploaded_file.state
+        if wait and state != "ACTIVE":
+            print("Waiting for processing...")
+            async for state in wait_active(client, uploaded_file.name):
+                if state == "ACTIVE":
+                    print("File ready!")
+                elif state == "FAILED":
+                    print("Processing failed!")
+                    sys.exit(1)
+                else:
+                    print("  Still processing...")
+
+        info = {
+            "name": uploaded_file.name,
+            "uri": uploaded_file.uri,
+            "display_name": uploaded_file.display_name,
+            "mime_type": mime_type,
+            "state": state,
+        }
+        if on_ready and state == "ACTIVE":
+            ready_tasks.append(asyncio.create_task(on_ready(info)))
+        return info
+
+    try:
+        results = await asyncio.gather(*(upload_one(path) for path in paths))
+        await asyncio.gather(*ready_tasks)
+    finally:
+        if cache:
+            cache.close()
+        # Async connections are bound to this event loop, so close them in it
+        await client.aio.aclose()
+        client.close()
+    return results
 
-    mime_type = MIME_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
 
-    print(f"Uploading {path}...")
+def upload_files(
+    paths: list[str],
+    display_name: str | None = None,
+    wait: bool = False,
+    on_ready: Callable[[dict], Awaitable[None]] | None = None,
+    use_cache: bool = True,
+    fast_loop: bool = False,
+) -> list[dict]:
+    """Upload files to Gemini File API concurrently.
 
-    uploaded_file = client.files.upload(
-        file=path,
-        config=types.UploadFileConfig(
-            mime_type=mime_type,
-            display_name=display_name or file_path.name,
+    Args:
+        paths: Paths to the files
+        display_name: Optional display name (applied to every file)
+        wait: Wait for processing to complete
+        on_ready: Optional coroutine function called with each file's info
+            as soon as it is ACTIVE
+        use_cache: Reuse earlier uploads of unchanged files
+        fast_loop: Run on uvloop if it is installed
+
+    Returns:
+        File info dicts, in input order
+    """
+    return run_async(
+        upload_files_async(
+            paths=paths,
+            display_name=display_name,
+            wait=wait,
+            on_ready=on_ready,
+            use_cache=use_cache,
         ),
+        fast_loop=fast_loop,
     )
 
-    print(f"Uploaded: {uploaded_file.name}")
-    print(f"URI: {uploaded_file.uri}")
-    print(f"State: {uploaded_file.state}")
-
-    if wait and uploaded_file.state != "ACTIVE":
-        print("Waiting for processing...")
-        while True:
-            file_info = client.files.get(name=uploaded_file.name)
-            if file_info.state == "ACTIVE":
-                print("File ready!")
-                break
-            elif file_info.state == "FAILED":
-                print("Processing failed!")
-                sys.exit(1)
-            time.sleep(2)
-            print("  Still processing...")
-
-    return {
-        "name": uploaded_file.name,
-        "uri": uploaded_file.uri,
-        "display_name": uploaded_file.display_name,
-        "mime_type": mime_type,
-        "state": uploaded_file.state,
-    }
+
+def upload_file(
+    path: str,
+    display_name: str | None = None,
+    wait: bool = False,
+    use_cache: bool = True,
+) -> dict:
+    """Upload a file to Gemini File API.
+
+    Args:
+        path: Path to the file
+        display_name: Optional display name
+        wait: Wait for processing to complete
+        use_cache: Reuse an earlier upload if the file is unchanged
+
+    Returns:
+        File info dict
+    """
+    return upload_files(
+        [path], display_name=display_name, wait=wait, use_cache=use_cache
+    )[0]
 
 
 def main():
     parser = argparse.ArgumentParser(description="Upload files to Gemini File API")
-    parser.add_argument("path", help="Path to the file to upload")
+    parser.add_argument("paths", nargs="+", help="Path(s) to the file(s) to upload")
     parser.add_argument("--name", "-n", help="Display name for the file")
     parser.add_argument(
         "--wait", "-w", action="store_true", help="Wait for processing to complete"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always upload, even if an unchanged copy was uploaded earlier",
+    )
+    parser.add_argument(
+        "--fast-loop",
+        action="store_true",
+        help="Run uploads on uvloop (requires: pip install uvloop)",
+    )
 
     args = parser.parse_args()
 
     try:
-        result = upload_file(
-            path=args.path,
+        results = upload_files(
+            paths=args.paths,
             display_name=args.name,
             wait=args.wait,
+            use_cache=not args.no_cache,
+            fast_loop=args.fast_loop,
         )
-        print(f"\nFile name: {result['name']}")
+        print()
+        for result in results:
+            print(f"File name: {result['name']}")
         print("Use this name to reference the file in API calls")
     except Exception as e:
         print(f"Error: {e}")
@@ -7,40 +7,249 @@ Usage:
     python generate_image.py "Mountain landscape" --aspect 16:9 --size 2K
     python generate_image.py "Portrait" --num 4 --output-dir ./my-images/ --name portrait
     python generate_image.py "Custom folder" --no-timestamp
+    python generate_image.py "Portrait" --model imagen-4.0-generate-001 --num 4 --async
+    python generate_image.py "Icon set" --num 4 --batch
+    python generate_image.py "Logo draft" --cache
 
 Requirements:
     pip install google-genai pillow
 """
 
 import argparse
+import atexit
+import binascii
+import functools
+import importlib.util
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
 
-    load_dotenv()
-except ImportError:
-    pass
+def new_client():
+    """Create a Gemini API client.
 
+    Connections are kept alive between requests, so repeated calls reuse
+    one TLS session instead of reconnecting. HTTP/2 is used when the
+    optional h2 package is installed.
 
-def get_client():
-    """Get Gemini API client."""
+    Async connections stay bound to the event loop that opened them, so
+    each asyncio.run() needs its own client, closed before the loop ends.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(
+            max_keepalive_connections=8, max_connections=16, keepalive_expiry=60.0
+        ),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
+
+
+@functools.cache
+def get_client():
+    """Get the Gemini API client for synchronous calls (created once per process)."""
+    client = new_client()
+    atexit.register(client.close)
+    return client
+
+
+# Largest single write; keeps each syscall's kernel copy bounded for 4K images
+WRITE_CHUNK = 1 << 20
+
+
+def save_image(filename: Path, image_data: bytes) -> None:
+    """Write image bytes to a file with unbuffered, zero-copy writes."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        view = memoryview(image_data)
+        while view:
+            view = view[os.write(fd, view[:WRITE_CHUNK]) :]
+    finally:
+        os.close(fd)
+
+
+def save_images(filenames: list[Path], images: list[bytes]) -> None:
+    """Write images in parallel, one thread per image up to the CPU count.
+
+    Each image is an independent file and os.write releases the GIL, so
+    the writes overlap instead of running back to back.
+    """
+    workers = max(1, min(len(filenames), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(save_image, filenames, images))
+
+
+# Opt-in cache of generated outputs (see --cache)
+CACHE_DIR = Path.home() / ".cache" / "google-studio-skills"
+
+
+def cache_file(suffix: str, *key_parts) -> Path:
+    """Return the cache path for an output generated from `key_parts`."""
+    import hashlib
+    import json
+
+    key = hashlib.blake2b(
+        json.dumps(key_parts, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+def cache_outputs(files: list[str], base: Path, cached: Path) -> None:
+    """Copy generated files into the cache directory `cached` atomically.
+
+    Each file is stored as "out" plus whatever follows `base` in its path
+    (e.g. "_0.png"), so a cache hit can be restored under a new base name.
+    """
+    import shutil
+    import tempfile
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=CACHE_DIR))
+    for file in files:
+        shutil.copyfile(file, tmp / f"out{file[len(str(base)) :]}")
+    try:
+        os.replace(tmp, cached)
+    except OSError:
+        # Another process cached the same request first
+        shutil.rmtree(tmp)
+
+
+# Poll interval cap while waiting for a batch job
+BATCH_POLL_CAP = 60.0
+
+
+def generate_images_batch(
+    client,
+    model: str,
+    prompt: str,
+    config,
+    num_images: int,
+    poll_interval: float = 10.0,
+) -> list[bytes]:
+    """Generate images with a Gemini model through the Batch API.
+
+    Batch jobs are billed at half the interactive rate but may take minutes
+    or longer to run. The job is polled with exponential backoff (plus up to
+    1s of jitter), starting at `poll_interval` and capped at BATCH_POLL_CAP.
+
+    Args:
+        client: Gemini API client
+        model: Gemini image model ID
+        prompt: Text description of the image
+        config: GenerateContentConfig for each request
+        num_images: Number of requests to put in the job
+        poll_interval: Initial poll interval in seconds
+
+    Returns:
+        Image bytes from all successful requests
+    """
+    import random
+
+    completed_states = {
+        "JOB_STATE_SUCCEEDED",
+        "JOB_STATE_FAILED",
+        "JOB_STATE_CANCELLED",
+        "JOB_STATE_EXPIRED",
+    }
+
+    request = {
+        "contents": [{"parts": [{"text": prompt}], "role": "user"}],
+        "config": config,
+    }
+    batch_job = client.batches.create(
+        model=model,
+        src=[request] * num_images,
+        config={"display_name": "generate-image"},
+    )
+    print(f"Batch job created: {batch_job.name}")
+
+    delay = poll_interval
+    while True:
+        state = (
+            batch_job.state.name
+            if hasattr(batch_job.state, "name")
+            else str(batch_job.state)
+        )
+        if state in completed_states:
+            break
+        print(f"Current state: {state}")
+        time.sleep(delay + random.uniform(0, 1.0))
+        delay = min(BATCH_POLL_CAP, delay * 2)
+        batch_job = client.batches.get(name=batch_job.name)
+
+    if state != "JOB_STATE_SUCCEEDED":
+        print(f"Error: Batch job ended in state {state}")
+        sys.exit(1)
+
+    images = []
+    for resp in batch_job.dest.inlined_responses:
+        if resp.error:
+            print(f"Warning: Request failed: {resp.error}", file=sys.stderr)
+            continue
+        if not (resp.response.candidates and resp.response.candidates[0].content):
+            continue
+        for part in resp.response.candidates[0].content.parts or []:
+            if part.inline_data and part.inline_data.data:
+                images.append(part.inline_data.data)
+    return images
+
+
+@functools.lru_cache(maxsize=64)
+def _build_image_config(aspect_ratio: str, image_size: str):
+    """Build a GenerateContentConfig for Gemini image output.
+
+    The returned config is shared between calls and must not be modified.
+    """
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio,
+            image_size=image_size,
+        )
+    )
+
+
+def _timestamp() -> str:
+    """Return a sortable local timestamp, unique to the microsecond.
+
+    Built from one time.time_ns() call, so rapid successive runs do not
+    collide the way whole-second timestamps did.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(seconds)) + (
+        f"_{nanos // 1000:06d}"
+    )
 
 
 def generate_image(
@@ -53,6 +262,10 @@ def generate_image(
     num_images: int = 1,
     person_generation: str = "allow_adult",
     use_timestamp: bool = True,
+    concurrent: bool = False,
+    batch: bool = False,
+    batch_poll_interval: float = 10.0,
+    use_cache: bool = False,
 ) -> list[str]:
     """Generate images using Imagen or Gemini models.
 
@@ -66,82 +279,161 @@ def generate_image(
         num_images: Number of images to generate (1-4)
         person_generation: Person policy (dont_allow, allow_adult, allow_all)
         use_timestamp: Add timestamp to filename
+        concurrent: For Imagen, send one request per image concurrently
+            instead of a single request for all of them
+        batch: For Gemini models, generate through the Batch API at half
+            the cost, waiting for the job to finish
+        batch_poll_interval: Initial batch job poll interval in seconds
+        use_cache: Copy the saved images if this exact request was made
+            before, and save new images
 
     Returns:
         List of saved file paths
     """
     from google.genai import types
 
-    client = get_client()
+    if batch and not model.startswith("gemini"):
+        print("Error: --batch is only supported for Gemini image models")
+        sys.exit(1)
+
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
     saved_files = []
 
     if use_timestamp:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _timestamp()
         base_filename = f"{output_name}_{timestamp}"
     else:
         base_filename = output_name
 
+    cached = None
+    if use_cache:
+        cached = cache_file(
+            "",
+            "image",
+            prompt,
+            model,
+            aspect_ratio,
+            image_size,
+            num_images,
+            person_generation,
+        )
+        if cached.is_dir():
+            import shutil
+
+            for entry in sorted(cached.iterdir()):
+                filename = output_path / f"{base_filename}{entry.name[len('out') :]}"
+                shutil.copyfile(entry, filename)
+                saved_files.append(str(filename))
+                print(f"Saved: {filename} (cached)")
+            return saved_files
+
     if model.startswith("imagen"):
         # Use Imagen API
-        response = client.models.generate_images(
-            model=model,
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=num_images,
-                aspect_ratio=aspect_ratio,
-                image_size=image_size,
-                person_generation=person_generation,
-            ),
+        config = types.GenerateImagesConfig(
+            number_of_images=1 if concurrent else num_images,
+            aspect_ratio=aspect_ratio,
+            image_size=image_size,
+            person_generation=person_generation,
         )
 
-        for i, generated_image in enumerate(response.generated_images):
+        if concurrent and num_images > 1:
+            import asyncio
+
+            # Wall-clock time is that of the slowest single-image request
+            async def generate_all():
+                async_client = new_client()
+                try:
+                    return await asyncio.gather(
+                        *(
+                            async_client.aio.models.generate_images(
+                                model=model, prompt=prompt, config=config
+                            )
+                            for _ in range(num_images)
+                        )
+                    )
+                finally:
+                    await async_client.aio.aclose()
+                    async_client.close()
+
+            generated_images = [
+                img
+                for response in asyncio.run(generate_all())
+                for img in response.generated_images
+            ]
+        else:
+            response = get_client().models.generate_images(
+                model=model, prompt=prompt, config=config
+            )
+            generated_images = response.generated_images
+
+        filenames = []
+        for i in range(len(generated_images)):
             suffix = f"_{i}" if num_images > 1 else ""
-            filename = output_path / f"{base_filename}{suffix}.png"
-            with open(filename, "wb") as f:
-                f.write(generated_image.image.image_bytes)
+            filenames.append(output_path / f"{base_filename}{suffix}.png")
+
+        save_images(filenames, [img.image.image_bytes for img in generated_images])
+
+        for filename in filenames:
             saved_files.append(str(filename))
             print(f"Saved: {filename}")
 
     elif model.startswith("gemini"):
         # Use Gemini generateContent API for image generation
-        config = types.GenerateContentConfig(
-            image_config=types.ImageConfig(
-                aspect_ratio=aspect_ratio,
-                image_size=image_size,
-            )
-        )
+        client = get_client()
+        config = _build_image_config(aspect_ratio, image_size)
 
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=config,
-        )
-
-        if response.candidates and response.candidates[0].content.parts:
-            for i, part in enumerate(response.candidates[0].content.parts):
-                if hasattr(part, "inline_data") and part.inline_data:
-                    suffix = (
-                        f"_{i}" if len(response.candidates[0].content.parts) > 1 else ""
-                    )
-                    filename = output_path / f"{base_filename}{suffix}.png"
+        if batch:
+            images = generate_images_batch(
+                client, model, prompt, config, num_images, batch_poll_interval
+            )
+            filenames = [
+                output_path / f"{base_filename}{f'_{i}' if len(images) > 1 else ''}.png"
+                for i in range(len(images))
+            ]
+            save_images(filenames, images)
+            for filename in filenames:
+                saved_files.append(str(filename))
+                print(f"Saved: {filename}")
+        else:
+            response = client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=config,
+            )
 
-                    import base64
+            filenames = []
+            images = []
+            if response.candidates and response.candidates[0].content.parts:
+                for i, part in enumerate(response.candidates[0].content.parts):
+                    inline_data = getattr(part, "inline_data", None)
+                    if inline_data:
+                        suffix = (
+                            f"_{i}"
+                            if len(response.candidates[0].content.parts) > 1
+                            else ""
+                        )
+                        filenames.append(output_path / f"{base_filename}{suffix}.png")
 
-                    image_data = part.inline_data.data
-                    if isinstance(image_data, str):
-                        image_data = base64.b64decode(image_data)
+                        # The SDK returns decoded bytes; only a raw base64
+                        # string needs decoding
+                        image_data = inline_data.data
+                        if isinstance(image_data, str):
+                            image_data = binascii.a2b_base64(image_data)
+                        images.append(image_data)
 
-                    with open(filename, "wb") as f:
-                        f.write(image_data)
-                    saved_files.append(str(filename))
-                    print(f"Saved: {filename}")
+            save_images(filenames, images)
+            for filename in filenames:
+                saved_files.append(str(filename))
+                print(f"Saved: {filename}")
     else:
         print(f"Error: Unknown model {model}")
         sys.exit(1)
 
+    if cached and saved_files:
+        cache_outputs(saved_files, output_path / base_filename, cached)
+
     return saved_files
 
 
@@ -197,8 +489,34 @@ def main():
         choices=["dont_allow", "allow_adult", "allow_all"],
         help="Person generation policy (default: allow_adult)",
     )
+    parser.add_argument(
+        "--async",
+        dest="concurrent",
+        action="store_true",
+        help="Imagen only: request each of the --num images concurrently",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Gemini only: generate the --num images as a Batch API job "
+        "(half price, may take minutes or longer)",
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=10.0,
+        help="Initial seconds between batch job status checks (default: 10)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the saved images for an identical earlier request "
+        "(~/.cache/google-studio-skills/)",
+    )
 
     args = parser.parse_args()
+    if args.batch_poll_interval <= 0:
+        parser.error("--batch-poll-interval must be a positive number of seconds")
 
     try:
         files = generate_image(
@@ -211,6 +529,10 @@ def main():
             num_images=args.num,
             person_generation=args.person,
             use_timestamp=not args.no_timestamp,
+            concurrent=args.concurrent,
+            batch=args.batch,
+            batch_poll_interval=args.batch_poll_interval,
+            use_cache=args.cache,
         )
         print(f"\nGenerated {len(files)} image(s)")
     except Exception as e:
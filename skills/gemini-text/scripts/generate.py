@@ -8,74 +8,291 @@ Usage:
     python generate.py "Return JSON" --json
     python generate.py "Current events" --grounding
     python generate.py "Be helpful" --system "You are a coding assistant"
+    python generate.py "Explain recursion" --cache
+    python generate.py "What is recursion?" --semantic-cache
 
 Requirements:
     pip install google-genai
 """
 
 import argparse
+import atexit
+import functools
+import importlib.util
 import os
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass
-
 
+@functools.cache
 def get_client():
-    """Get Gemini API client."""
+    """Get Gemini API client (created once per process).
+
+    Connections are kept alive between requests, so repeated calls reuse
+    one TLS session instead of reconnecting. HTTP/2 is used when the
+    optional h2 package is installed.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(
+            max_keepalive_connections=8, max_connections=16, keepalive_expiry=60.0
+        ),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    client = genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
+    atexit.register(client.close)
+    return client
 
 
-def generate_content(
-    prompt: str,
-    model: str = "gemini-3-flash-preview",
+# Opt-in cache of generated outputs (see --cache)
+CACHE_DIR = Path.home() / ".cache" / "google-studio-skills"
+
+
+def cache_file(suffix: str, *key_parts) -> Path:
+    """Return the cache path for an output generated from `key_parts`."""
+    import hashlib
+    import json
+
+    key = hashlib.blake2b(
+        json.dumps(key_parts, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+# Near-duplicate prompt lookup (see --semantic-cache): prompts are embedded
+# and compared against the most recently cached prompts with the same settings
+SEMANTIC_CACHE_PATH = CACHE_DIR / "semantic.sqlite"
+SEMANTIC_EMBED_MODEL = "gemini-embedding-001"
+SEMANTIC_DIM = 768
+SEMANTIC_CACHE_SIZE = 10_000
+
+
+def require_numpy():
+    """Import numpy or exit with an install hint."""
+    try:
+        import numpy as np
+    except ImportError:
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    return np
+
+
+def open_semantic_cache():
+    """Open the semantic response cache, creating it if needed.
+
+    Returns:
+        sqlite3 connection, or None if the cache cannot be opened
+    """
+    import sqlite3
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(SEMANTIC_CACHE_PATH)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (scope TEXT, vec BLOB, text TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope)")
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Semantic cache disabled: {e}", file=sys.stderr)
+        return None
+    return conn
+
+
+def embed_prompt(client, prompt: str):
+    """Embed a prompt as a unit-length float32 vector."""
+    from google.genai import types
+
+    np = require_numpy()
+
+    response = client.models.embed_content(
+        model=SEMANTIC_EMBED_MODEL,
+        contents=prompt,
+        config=types.EmbedContentConfig(
+            task_type="SEMANTIC_SIMILARITY", output_dimensionality=SEMANTIC_DIM
+        ),
+    )
+    vec = np.asarray(response.embeddings[0].values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def semantic_lookup(conn, scope: str, query, threshold: float) -> str | None:
+    """Return the cached response of the most similar earlier prompt.
+
+    Args:
+        conn: Open semantic cache connection
+        scope: Settings the earlier request must share
+        query: Unit-length embedding of the prompt
+        threshold: Minimum cosine similarity to accept a match
+
+    Returns:
+        The cached response text, or None if no prompt is similar enough
+    """
+    np = require_numpy()
+
+    rows = conn.execute(
+        "SELECT rowid, vec FROM responses WHERE scope = ? ORDER BY rowid DESC LIMIT ?",
+        (scope, SEMANTIC_CACHE_SIZE),
+    ).fetchall()
+    if not rows:
+        return None
+
+    vectors = np.frombuffer(b"".join(vec for _, vec in rows), dtype=np.float32)
+    scores = vectors.reshape(len(rows), SEMANTIC_DIM) @ query
+    best = int(scores.argmax())
+    if scores[best] < threshold:
+        return None
+    return conn.execute(
+        "SELECT text FROM responses WHERE rowid = ?", (rows[best][0],)
+    ).fetchone()[0]
+
+
+# Leading bytes of the image formats Gemini accepts inline
+IMAGE_SIGNATURES = (
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (8, b"WEBP", "image/webp"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (4, b"ftypheic", "image/heic"),
+    (4, b"ftypheix", "image/heic"),
+    (4, b"ftypmif1", "image/heif"),
+)
+
+
+def image_mime_type(path: Path, data: bytes) -> str:
+    """Detect an image's MIME type from its contents.
+
+    Falls back to the file extension for formats without a known signature.
+
+    Args:
+        path: Image file path
+        data: Image file contents
+
+    Returns:
+        The image MIME type
+    """
+    for offset, magic, mime_type in IMAGE_SIGNATURES:
+        if data.startswith(magic, offset):
+            return mime_type
+
+    import mimetypes
+
+    mime_type = mimetypes.guess_type(path.name)[0]
+    if not mime_type or not mime_type.startswith("image/"):
+        print(f"Error: Unsupported image format: {path}")
+        sys.exit(1)
+    return mime_type
+
+
+@functools.lru_cache(maxsize=64)
+def _build_text_config(
+    system_instruction: str | None,
+    thinking: bool,
+    json_output: bool,
+    grounding: bool,
+    temperature: float | None,
+    max_tokens: int | None,
+):
+    """Build a GenerateContentConfig, reusing it for repeated settings.
+
+    The returned config is shared between calls and must not be modified.
+    """
+    from google.genai import types
+
+    config = types.GenerateContentConfig()
+
+    if system_instruction:
+        config.system_instruction = system_instruction
+
+    if thinking:
+        config.thinking_config = types.ThinkingConfig(thinking_budget=1024)
+
+    if json_output:
+        config.response_mime_type = "application/json"
+
+    if grounding:
+        config.tools = [types.Tool(google_search=types.GoogleSearch())]
+
+    if temperature is not None:
+        config.temperature = temperature
+
+    if max_tokens is not None:
+        config.max_output_tokens = max_tokens
+
+    return config
+
+
+def make_session(
     image_path: str | None = None,
+    model: str = "gemini-3-flash-preview",
     system_instruction: str | None = None,
     thinking: bool = False,
     json_output: bool = False,
     grounding: bool = False,
     temperature: float | None = None,
     max_tokens: int | None = None,
-) -> str:
-    """Generate content using Gemini with advanced settings.
+    use_cache: bool = False,
+    semantic_cache: bool = False,
+    semantic_threshold: float = 0.92,
+    stream: bool = False,
+) -> Callable[[str], str]:
+    """Prepare a generate function for many prompts with the same settings.
+
+    The image is read and its request part is built once, so each prompt
+    only adds its own text part.
 
     Args:
-        prompt: The text prompt
-        model: Model ID (default: gemini-3-flash-preview)
         image_path: Optional path to image for multimodal
+        model: Model ID (default: gemini-3-flash-preview)
         system_instruction: Optional system instruction
         thinking: Enable thinking mode
         json_output: Force JSON response format
         grounding: Enable Google Search grounding
         temperature: Sampling temperature (0.0-2.0)
         max_tokens: Maximum output tokens
+        use_cache: Return the saved response if this exact request was made
+            before, and save new responses
+        semantic_cache: Return the saved response of a similar earlier
+            prompt with the same settings (text-only prompts; needs numpy)
+        semantic_threshold: Prompt embedding similarity required for a match
+        stream: Write the response to stdout as it is generated
 
     Returns:
-        Generated text response
+        A function that takes a prompt and returns the generated text
     """
     from google.genai import types
 
-    client = get_client()
-
-    # Build contents
-    contents = []
+    image_part = None
+    image_key = None
     if image_path:
         path = Path(image_path)
         if not path.exists():
@@ -83,47 +300,166 @@ def generate_content(
             sys.exit(1)
 
         image_bytes = path.read_bytes()
-        mime_type = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
-
-        contents = types.Content(
-            parts=[
-                types.Part(text=prompt),
-                types.Part(
-                    inline_data=types.Blob(mime_type=mime_type, data=image_bytes)
-                ),
-            ],
-            role="user",
+        mime_type = image_mime_type(path, image_bytes)
+        image_part = types.Part(
+            inline_data=types.Blob(mime_type=mime_type, data=image_bytes)
         )
-    else:
-        contents = prompt
+        if use_cache:
+            import hashlib
 
-    # Build config
-    config = types.GenerateContentConfig()
+            image_key = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
 
-    if system_instruction:
-        config.system_instruction = system_instruction
+    config = _build_text_config(
+        system_instruction, thinking, json_output, grounding, temperature, max_tokens
+    )
 
-    if thinking:
-        config.thinking_config = types.ThinkingConfig(thinking_budget=1024)
+    def generate(prompt: str) -> str:
+        cached = None
+        if use_cache:
+            cached = cache_file(
+                ".txt",
+                "text",
+                prompt,
+                model,
+                image_key,
+                system_instruction,
+                thinking,
+                json_output,
+                grounding,
+                temperature,
+                max_tokens,
+            )
+            if cached.exists():
+                text = cached.read_text(encoding="utf-8")
+                if stream:
+                    sys.stdout.write(text)
+                return text
+
+        client = get_client()
+
+        semantic = None
+        if semantic_cache and image_part is None:
+            conn = open_semantic_cache()
+            if conn:
+                scope = cache_file(
+                    "",
+                    model,
+                    system_instruction,
+                    thinking,
+                    json_output,
+                    grounding,
+                    temperature,
+                    max_tokens,
+                ).name
+                query = embed_prompt(client, prompt)
+                text = semantic_lookup(conn, scope, query, semantic_threshold)
+                if text is not None:
+                    conn.close()
+                    if stream:
+                        sys.stdout.write(text)
+                    return text
+                semantic = (conn, scope, query)
+
+        # Build contents
+        if image_part is None:
+            contents = prompt
+        else:
+            contents = types.Content(
+                parts=[types.Part(text=prompt), image_part], role="user"
+            )
+
+        # Generate
+        if stream:
+            pieces = []
+            for chunk in client.models.generate_content_stream(
+                model=model, contents=contents, config=config
+            ):
+                if chunk.text:
+                    sys.stdout.write(chunk.text)
+                    sys.stdout.flush()
+                    pieces.append(chunk.text)
+            text = "".join(pieces) if pieces else None
+        else:
+            response = client.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+            text = response.text
+
+        if cached and text is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, cached)
+
+        if semantic:
+            conn, scope, query = semantic
+            if text is not None:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO responses (scope, vec, text) VALUES (?, ?, ?)",
+                        (scope, query.tobytes(), text),
+                    )
+            conn.close()
+
+        return text
+
+    return generate
 
-    if json_output:
-        config.response_mime_type = "application/json"
 
-    if grounding:
-        config.tools = [types.Tool(google_search=types.GoogleSearch())]
+def generate_content(
+    prompt: str,
+    model: str = "gemini-3-flash-preview",
+    image_path: str | None = None,
+    system_instruction: str | None = None,
+    thinking: bool = False,
+    json_output: bool = False,
+    grounding: bool = False,
+    temperature: float | None = None,
+    max_tokens: int | None = None,
+    use_cache: bool = False,
+    semantic_cache: bool = False,
+    semantic_threshold: float = 0.92,
+    stream: bool = False,
+) -> str:
+    """Generate content using Gemini with advanced settings.
 
-    if temperature is not None:
-        config.temperature = temperature
+    To send many prompts with the same image or settings, use make_session().
 
-    if max_tokens is not None:
-        config.max_output_tokens = max_tokens
+    Args:
+        prompt: The text prompt
+        model: Model ID (default: gemini-3-flash-preview)
+        image_path: Optional path to image for multimodal
+        system_instruction: Optional system instruction
+        thinking: Enable thinking mode
+        json_output: Force JSON response format
+        grounding: Enable Google Search grounding
+        temperature: Sampling temperature (0.0-2.0)
+        max_tokens: Maximum output tokens
+        use_cache: Return the saved response if this exact request was made
+            before, and save new responses
+        semantic_cache: Return the saved response of a similar earlier
+            prompt with the same settings (text-only prompts; needs numpy)
+        semantic_threshold: Prompt embedding similarity required for a match
+        stream: Write the response to stdout as it is generated
 
-    # Generate
-    response = client.models.generate_content(
-        model=model, contents=contents, config=config
+    Returns:
+        Generated text response
+    """
+    generate = make_session(
+        image_path=image_path,
+        model=model,
+        system_instruction=system_instruction,
+        thinking=thinking,
+        json_output=json_output,
+        grounding=grounding,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        use_cache=use_cache,
+        semantic_cache=semantic_cache,
+        semantic_threshold=semantic_threshold,
+        stream=stream,
     )
-
-    return response.text
+    return generate(prompt)
 
 
 def main():
@@ -152,6 +488,30 @@ def main():
         "--temperature", type=float, help="Sampling temperature (0.0-2.0)"
     )
     parser.add_argument("--max-tokens", type=int, help="Maximum output tokens")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the saved response for an identical earlier request "
+        "(~/.cache/google-studio-skills/)",
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Reuse the saved response of a similar earlier prompt with the "
+        "same settings (requires numpy)",
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=0.92,
+        help="Prompt similarity required for a --semantic-cache match (default: 0.92)",
+    )
+    parser.add_argument(
+        "--stream",
+        "-S",
+        action="store_true",
+        help="Print the response as it is generated",
+    )
 
     args = parser.parse_args()
 
@@ -166,8 +526,16 @@ def main():
             grounding=args.grounding,
             temperature=args.temperature,
             max_tokens=args.max_tokens,
+            use_cache=args.cache,
+            semantic_cache=args.semantic_cache,
+            semantic_threshold=args.semantic_threshold,
+            stream=args.stream,
         )
-        print(result)
+        if args.stream:
+            # The response has already been printed as it arrived
+            print()
+        else:
+            print(result)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -5,84 +5,409 @@ Usage:
     python tts.py "Hello, world!"
     python tts.py "Welcome!" --voice Puck --output welcome
     python tts.py "Conversation text" --speakers "Joe:Kore,Jane:Puck"
+    python tts.py "$(cat dialogue.txt)" --speakers "Joe:Kore,Jane:Puck" --parallel-speakers
     python tts.py "Long text" --stream
     python tts.py "Custom folder" --output-dir ./my-audio/
+    python tts.py "Welcome back!" --cache
+    python tts.py "Read this aloud" --stdout | aplay
+    python tts.py "For speech recognition" --rate 16000
+    python tts.py --batch lines.jsonl
 
 Requirements:
     pip install google-genai
 """
 
-import argparse
+import atexit
+import functools
+import importlib.util
+import math
 import os
+import re
 import sys
-import wave
+import time
 from pathlib import Path
-from datetime import datetime
 
-# Load .env file if present
-try:
-    from dotenv import load_dotenv
 
-    load_dotenv()
-except ImportError:
-    pass
+def new_client():
+    """Create a Gemini API client.
 
+    Connections are kept alive between requests, so repeated calls reuse
+    one TLS session instead of reconnecting. HTTP/2 is used when the
+    optional h2 package is installed.
 
-def get_client():
-    """Get Gemini API client."""
+    Async connections stay bound to the event loop that opened them, so
+    each asyncio.run() needs its own client, closed before the loop ends.
+    """
     try:
+        import httpx
         from google import genai
+        from google.genai import types
     except ImportError:
         print("Error: google-genai not installed. Run: pip install google-genai")
         sys.exit(1)
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        # Only look for a .env file when the key is not already set
+        try:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: Set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
         sys.exit(1)
 
-    return genai.Client(api_key=api_key)
+    http_args = {
+        "limits": httpx.Limits(
+            max_keepalive_connections=8, max_connections=16, keepalive_expiry=60.0
+        ),
+        # HTTP/2 requires the optional h2 package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args=http_args, async_client_args=http_args
+        ),
+    )
 
 
-def save_wav(filename: str, audio_data: bytes, rate: int = 24000):
-    """Save raw PCM audio data to WAV file."""
-    with wave.open(filename, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)  # 16-bit
-        wf.setframerate(rate)
-        wf.writeframes(audio_data)
+@functools.cache
+def get_client():
+    """Get the Gemini API client for synchronous calls (created once per process)."""
+    client = new_client()
+    atexit.register(client.close)
+    return client
 
 
-def generate_tts(
-    text: str,
-    voice: str = "Kore",
-    output_dir: str = "audio/",
-    output_name: str = "tts_output",
-    model: str = "gemini-2.5-flash-preview-tts",
-    stream: bool = False,
-    speakers: dict | None = None,
-    use_timestamp: bool = True,
-) -> str:
-    """Generate speech from text.
+# Opt-in cache of generated outputs (see --cache)
+CACHE_DIR = Path.home() / ".cache" / "google-studio-skills"
+
+
+def cache_file(suffix: str, *key_parts) -> Path:
+    """Return the cache path for an output generated from `key_parts`."""
+    import hashlib
+    import json
+
+    key = hashlib.blake2b(
+        json.dumps(key_parts, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+# Sample rate of the audio returned by the TTS models
+TTS_RATE = 24000
+
+
+def require_numpy():
+    """Import numpy or exit with an install hint."""
+    try:
+        import numpy as np
+    except ImportError:
+        print("Error: numpy not installed. Run: pip install numpy")
+        sys.exit(1)
+    return np
+
+
+def resample_chunks(chunks, rate: int, source_rate: int = TTS_RATE):
+    """Resample 16-bit mono PCM chunks to `rate` as they arrive.
+
+    Uses a polyphase Kaiser-windowed sinc low-pass filter, the same design
+    as scipy.signal.resample_poly, so the whole stream matches resampling
+    it in one piece. The last input samples are kept between chunks, so
+    chunk boundaries do not click.
 
     Args:
-        text: Text to convert to speech
-        voice: Voice name (for single speaker)
-        output_dir: Directory to save audio file
-        output_name: Base name for output file
-        model: TTS model ID
-        stream: Use streaming for long text
-        speakers: Dict mapping speaker names to voices (for multi-speaker)
-        use_timestamp: Add timestamp to filename
+        chunks: Iterable of PCM byte strings at `source_rate`
+        rate: Output sample rate
+        source_rate: Input sample rate
+
+    Yields:
+        PCM byte strings at `rate`
+    """
+    if rate == source_rate:
+        yield from chunks
+        return
+
+    np = require_numpy()
+
+    g = math.gcd(rate, source_rate)
+    up, down = rate // g, source_rate // g
+    half = 10 * max(up, down)
+    taps = np.sinc(np.arange(-half, half + 1) / max(up, down))
+    taps *= np.kaiser(2 * half + 1, 5.0)
+    taps *= up / taps.sum()
+    # phases[p, j] is the tap applied to input sample i0 - j for phase p
+    width = -(-taps.size // up)
+    phases = np.zeros(width * up)
+    phases[: taps.size] = taps
+    phases = phases.reshape(width, up).T
+    offsets = np.arange(width)
+
+    # buf[0] is input sample `start`; samples before the stream are silence
+    buf = np.zeros(width)
+    start = -width
+    received = 0  # input samples so far
+    produced = 0  # output samples so far
+    leftover = b""
+
+    def emit(count):
+        nonlocal buf, start, produced
+        if count <= produced:
+            return b""
+        # Output m is centred on upsampled position m * down + half
+        pos = np.arange(produced, count) * down + half
+        first, phase = np.divmod(pos, up)
+        window = buf[first[:, None] - offsets - start]
+        out = np.einsum("ij,ij->i", window, phases[phase])
+        produced = count
+
+        keep = (produced * down + half) // up - (width - 1) - start
+        buf = buf[keep:]
+        start += keep
+        return np.clip(np.rint(out), -32768, 32767).astype("<i2").tobytes()
+
+    for data in chunks:
+        data = leftover + data
+        leftover = data[len(data) & ~1 :]
+        samples = np.frombuffer(data, dtype="<i2", count=len(data) // 2)
+        buf = np.concatenate((buf, samples))
+        received += samples.size
+        # Outputs whose centre input sample has arrived
+        out = emit(max((received * up - 1 - half) // down + 1, 0))
+        if out:
+            yield out
+
+    # Flush the filter tail against trailing silence
+    total = -(-received * up // down)
+    last = ((total - 1) * down + half) // up if total else 0
+    buf = np.concatenate((buf, np.zeros(max(last - received + 1, 0))))
+    out = emit(total)
+    if out:
+        yield out
+
+
+# Size field value for WAV data of unknown length (streamed to a pipe)
+UNKNOWN_WAV_SIZE = 0xFFFFFFFF
+
+
+def wav_header(data_size: int, rate: int = 24000) -> bytes:
+    """Build the 44-byte header of a mono 16-bit PCM WAV file."""
+    import struct
+
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        min(36 + data_size, UNKNOWN_WAV_SIZE),
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # mono
+        rate,
+        rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        data_size,
+    )
+
+
+def save_wav(filename: str, audio_data: bytes | list[bytes], rate: int = 24000):
+    """Save raw PCM audio data to WAV file.
+
+    The size is known up front, so the header is written with its final
+    values and header and samples go out in a single writev call, without
+    seeking back to patch sizes. A list of PCM segments is written back to
+    back without joining them first.
+    """
+    segments = [audio_data] if isinstance(audio_data, bytes) else audio_data
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        data_size = sum(len(segment) for segment in segments)
+        buffers = [memoryview(wav_header(data_size, rate))]
+        buffers += [memoryview(segment) for segment in segments if segment]
+        if hasattr(os, "writev"):
+            while buffers:
+                written = os.writev(fd, buffers)
+                # Drop what was written; a partial write resumes mid-buffer
+                while buffers and written >= len(buffers[0]):
+                    written -= len(buffers.pop(0))
+                if buffers:
+                    buffers[0] = buffers[0][written:]
+        else:
+            for view in buffers:
+                while view:
+                    view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def rechunk(chunks, chunk_size: int):
+    """Group chunks into writes of at least `chunk_size` bytes.
+
+    Fewer, larger writes cost fewer syscalls; a chunk_size of 0 passes
+    every chunk through as soon as it arrives, for the lowest latency.
+    """
+    if chunk_size <= 0:
+        yield from chunks
+        return
+
+    buf = bytearray()
+    for data in chunks:
+        buf += data
+        if len(buf) >= chunk_size:
+            # A new buffer, since the writer may still hold this one
+            yield buf
+            buf = bytearray()
+    if buf:
+        yield buf
+
+
+def write_behind(write, chunks) -> bool:
+    """Call `write` for each chunk on a worker thread, in order.
+
+    Writing one chunk overlaps with waiting for the next one from the
+    network. Only one write is in flight at a time, so at most two chunks
+    are held in memory, and a failed write is raised on the next chunk.
 
     Returns:
-        Path to saved audio file
+        True if any chunk was written
     """
-    from google.genai import types
+    from concurrent.futures import ThreadPoolExecutor
+
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for data in chunks:
+            if pending:
+                pending.result()
+            pending = writer.submit(write, data)
+        if pending:
+            pending.result()
+    return pending is not None
+
+
+def pipe_wav(out, chunks, rate: int = 24000) -> bool:
+    """Write raw PCM chunks as a WAV stream to a binary file object.
+
+    The header is sent with the first chunk and marks the length as
+    unknown, so players such as aplay or ffplay start before the stream
+    ends. Each chunk is flushed as soon as it arrives.
+
+    Returns:
+        True if any audio was written
+    """
+    header = [wav_header(UNKNOWN_WAV_SIZE, rate)]
+
+    def write(data):
+        if header:
+            out.write(header.pop())
+        out.write(data)
+        out.flush()
+
+    return write_behind(write, chunks)
+
 
-    client = get_client()
+def stream_wav(filename: Path, chunks, rate: int = 24000) -> bool:
+    """Write raw PCM chunks to a WAV file as they arrive.
+
+    Only one chunk is held in memory at a time. Audio is written to a
+    ".part" file that is renamed into place when the stream ends, so a
+    failed stream leaves no truncated WAV behind.
+
+    Returns:
+        True if any audio was written
+    """
+    import wave
+
+    tmp = filename.with_name(filename.name + ".part")
+    try:
+        with wave.open(str(tmp), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)  # 16-bit
+            wf.setframerate(rate)
+            # Sizes in the header are patched once, when the file closes
+            written = write_behind(wf.writeframesraw, chunks)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    if written:
+        os.replace(tmp, filename)
+    else:
+        tmp.unlink()
+    return written
+
+
+# Prebuilt voices accepted by the TTS models (names are case-sensitive)
+VALID_VOICES = frozenset(
+    {
+        "Achernar",
+        "Achird",
+        "Algenib",
+        "Algieba",
+        "Alnilam",
+        "Aoede",
+        "Autonoe",
+        "Callirrhoe",
+        "Charon",
+        "Despina",
+        "Enceladus",
+        "Erinome",
+        "Fenrir",
+        "Gacrux",
+        "Iapetus",
+        "Kore",
+        "Laomedeia",
+        "Leda",
+        "Orus",
+        "Puck",
+        "Pulcherrima",
+        "Rasalgethi",
+        "Sadachbia",
+        "Sadaltager",
+        "Schedar",
+        "Sulafat",
+        "Umbriel",
+        "Vindemiatrix",
+        "Zephyr",
+        "Zubenelgenubi",
+    }
+)
+
+
+def check_voices(voice: str, speakers: dict | None = None):
+    """Warn about voice names the API is not known to accept.
+
+    Unknown names only produce a warning, so voices added to the API later
+    keep working without a script update.
+    """
+    for name in speakers.values() if speakers else (voice,):
+        if name not in VALID_VOICES:
+            hint = name.capitalize()
+            hint = f" (did you mean {hint}?)" if hint in VALID_VOICES else ""
+            print(f"Warning: Unknown voice '{name}'{hint}", file=sys.stderr)
+
+
+def build_tts_config(voice: str, speakers: dict | None = None):
+    """Build the GenerateContentConfig for one voice or a speaker mapping.
+
+    The returned config is shared between calls and must not be modified.
+    """
+    if speakers:
+        return _build_tts_config(None, tuple(speakers.items()))
+    return _build_tts_config(voice, None)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_tts_config(voice: str | None, speakers: tuple | None):
+    """Build a GenerateContentConfig, reusing it for repeated voices."""
+    from google.genai import types
 
-    # Build speech config
     if speakers:
         speaker_configs = [
             types.SpeakerVoiceConfig(
@@ -91,7 +416,7 @@ def generate_tts(
                     prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=v)
                 ),
             )
-            for name, v in speakers.items()
+            for name, v in speakers
         ]
         speech_config = types.SpeechConfig(
             multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
@@ -105,70 +430,418 @@ def generate_tts(
             )
         )
 
-    config = types.GenerateContentConfig(
+    return types.GenerateContentConfig(
         response_modalities=["AUDIO"],
         speech_config=speech_config,
     )
 
-    contents = [types.Content(role="user", parts=[types.Part.from_text(text=text)])]
 
-    all_audio = b""
+def response_audio(response) -> bytes | None:
+    """Return the PCM audio of a response or stream chunk, if any.
 
-    if stream:
-        print("Streaming audio...")
-        for chunk in client.models.generate_content_stream(
-            model=model, contents=contents, config=config
-        ):
-            if chunk.candidates and chunk.candidates[0].content.parts:
-                part = chunk.candidates[0].content.parts[0]
-                if hasattr(part, "inline_data") and part.inline_data:
-                    all_audio += part.inline_data.data
-    else:
-        response = client.models.generate_content(
-            model=model, contents=contents, config=config
-        )
-        if response.candidates and response.candidates[0].content.parts:
-            part = response.candidates[0].content.parts[0]
-            if hasattr(part, "inline_data") and part.inline_data:
-                all_audio = part.inline_data.data
+    Called for every streamed chunk, so each attribute is read only once.
+    """
+    candidates = response.candidates
+    if not candidates:
+        return None
+    parts = candidates[0].content.parts
+    if not parts:
+        return None
+    inline_data = getattr(parts[0], "inline_data", None)
+    return inline_data.data if inline_data else None
 
-    if all_audio:
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
 
-        if use_timestamp:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = output_name + "_" + timestamp
+# Rate limiting and transient server errors are retried with backoff
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 5
+RETRY_DELAY_CAP = 30.0
+
+
+def retry_delay(error: Exception, attempt: int) -> float | None:
+    """Return how long to wait before retrying a failed request.
+
+    The delay doubles with each attempt up to RETRY_DELAY_CAP, plus up to
+    1s of jitter so concurrent requests do not retry in lockstep.
+
+    Args:
+        error: Exception raised by the request
+        attempt: Number of the failed attempt, starting at 0
+
+    Returns:
+        Seconds to wait, or None if the error should be raised
+    """
+    import random
+
+    from google.genai import errors
+
+    if (
+        not isinstance(error, errors.APIError)
+        or error.code not in RETRY_STATUS_CODES
+        or attempt + 1 >= MAX_ATTEMPTS
+    ):
+        return None
+    delay = min(2**attempt, RETRY_DELAY_CAP) + random.uniform(0, 1.0)
+    print(f"Warning: API error {error.code}, retrying in {delay:.1f}s", file=sys.stderr)
+    return delay
+
+
+def call_with_retries(call, **kwargs):
+    """Call `call(**kwargs)`, retrying transient API errors."""
+    attempt = 0
+    while True:
+        try:
+            return call(**kwargs)
+        except Exception as e:
+            delay = retry_delay(e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+
+
+async def call_with_retries_async(call, **kwargs):
+    """Await `call(**kwargs)`, retrying transient API errors."""
+    import asyncio
+
+    attempt = 0
+    while True:
+        try:
+            return await call(**kwargs)
+        except Exception as e:
+            delay = retry_delay(e, attempt)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+# Upper bound on concurrent requests for --parallel-speakers and --batch
+MAX_CONCURRENT_REQUESTS = 8
+
+TURN_PATTERN = re.compile(r"\s*([^:]+?)\s*:\s*(.*)")
+
+
+def split_turns(text: str, speakers: dict) -> list[tuple[str, str]] | None:
+    """Split a dialogue into turns, one per run of lines by the same speaker.
+
+    Lines without a known "Speaker:" prefix continue the previous turn.
+
+    Args:
+        text: Dialogue with lines like "Joe: Hello"
+        speakers: Dict mapping speaker names to voices
+
+    Returns:
+        (speaker, text) pairs in order, or None if the text does not start
+        with a known speaker
+    """
+    turns = []
+    for line in text.splitlines():
+        match = TURN_PATTERN.fullmatch(line)
+        if match and match[1] in speakers:
+            name, line = match[1], match[2]
+        elif turns:
+            name = turns[-1][0]
+        elif not line.strip():
+            continue
+        else:
+            return None
+
+        if turns and turns[-1][0] == name:
+            turns[-1][1].append(line)
         else:
-            filename = output_name
+            turns.append((name, [line]))
+
+    turns = [(name, "\n".join(lines).strip()) for name, lines in turns]
+    return [(name, line) for name, line in turns if line] or None
+
+
+def generate_turns(
+    model: str, turns: list[tuple[str, str]], speakers: dict
+) -> list[bytes]:
+    """Generate each dialogue turn with its speaker's voice, concurrently.
+
+    Returns:
+        PCM audio of each turn, in turn order
+    """
+    import asyncio
+
+    async def generate_turn(client, semaphore, name, line):
+        config = build_tts_config(speakers[name])
+        async with semaphore:
+            response = await call_with_retries_async(
+                client.aio.models.generate_content,
+                model=model,
+                contents=line,
+                config=config,
+            )
+        audio = response_audio(response)
+        if not audio:
+            raise RuntimeError(f"No audio generated for {name}: {line[:50]}")
+        return audio
+
+    # Wall-clock time is about that of the slowest turn
+    async def generate_all():
+        client = new_client()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        try:
+            return await asyncio.gather(
+                *(generate_turn(client, semaphore, name, line) for name, line in turns)
+            )
+        finally:
+            await client.aio.aclose()
+            client.close()
+
+    return asyncio.run(generate_all())
+
+
+def _timestamp() -> str:
+    """Return a sortable local timestamp, unique to the microsecond.
+
+    Built from one time.time_ns() call, so rapid successive runs do not
+    collide the way whole-second timestamps did.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(seconds)) + (
+        f"_{nanos // 1000:06d}"
+    )
+
+
+def output_file(output_dir: str, output_name: str, use_timestamp: bool) -> Path:
+    """Return the WAV path for `output_name`, optionally timestamped.
+
+    A ".wav" extension in `output_name`, in any case, is not repeated.
+    """
+    path = Path(output_dir) / output_name
+    if path.suffix.lower() == ".wav":
+        path = path.with_suffix("")
+    if use_timestamp:
+        path = path.with_name(f"{path.name}_{_timestamp()}")
+    return path.with_name(f"{path.name}.wav")
+
+
+def generate_tts(
+    text: str,
+    voice: str = "Kore",
+    output_dir: str = "audio/",
+    output_name: str = "tts_output",
+    model: str = "gemini-2.5-flash-preview-tts",
+    stream: bool = False,
+    speakers: dict | None = None,
+    use_timestamp: bool = True,
+    use_cache: bool = False,
+    parallel_speakers: bool = False,
+    to_stdout: bool = False,
+    rate: int = TTS_RATE,
+    chunk_size: int = 0,
+) -> str:
+    """Generate speech from text.
+
+    Args:
+        text: Text to convert to speech
+        voice: Voice name (for single speaker)
+        output_dir: Directory to save audio file
+        output_name: Base name for output file
+        model: TTS model ID
+        stream: Use streaming for long text
+        speakers: Dict mapping speaker names to voices (for multi-speaker)
+        use_timestamp: Add timestamp to filename
+        use_cache: Copy the saved audio if this exact request was made
+            before, and save new audio
+        parallel_speakers: With speakers, generate each "Speaker: line" turn
+            as a separate single-voice request, all at once (not streamed)
+        to_stdout: Stream the WAV to stdout instead of saving a file; status
+            messages go to stderr
+        rate: Output sample rate; audio is resampled from 24000 Hz as it
+            arrives (needs numpy)
+        chunk_size: With stream or to_stdout, collect at least this many
+            bytes per write (0 writes each chunk as it arrives)
 
-        if not filename.endswith(".wav"):
-            filename += ".wav"
+    Returns:
+        Path to saved audio file, or "-" when written to stdout
+    """
+    check_voices(voice, speakers)
+
+    output_path = Path(output_dir)
+    full_path = output_file(output_dir, output_name, use_timestamp)
+
+    turns = None
+    if parallel_speakers and speakers and not (stream or to_stdout):
+        turns = split_turns(text, speakers)
+
+    cached = None
+    if use_cache and not to_stdout:
+        kind = "tts-turns" if turns else "tts"
+        if rate != TTS_RATE:
+            kind += f"@{rate}"
+        cached = cache_file(".wav", kind, text, model, speakers or voice)
+        if cached.exists():
+            import shutil
+
+            output_path.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, full_path)
+            print(f"Saved: {full_path} (cached)")
+            return str(full_path)
+
+    if turns:
+        print(f"Generating {len(turns)} turns in parallel...")
+        segments = generate_turns(model, turns, speakers)
+        output_path.mkdir(parents=True, exist_ok=True)
+        save_wav(str(full_path), list(resample_chunks(segments, rate)), rate)
+        saved = True
+    elif stream or to_stdout:
+        client = get_client()
+        config = build_tts_config(voice, speakers)
+        print("Streaming audio...", file=sys.stderr if to_stdout else sys.stdout)
+
+        def audio_chunks():
+            attempt = 0
+            started = False
+            while True:
+                try:
+                    for chunk in client.models.generate_content_stream(
+                        model=model, contents=text, config=config
+                    ):
+                        audio = response_audio(chunk)
+                        if audio:
+                            started = True
+                            yield audio
+                    return
+                except Exception as e:
+                    # Audio already written cannot be taken back
+                    delay = None if started else retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    attempt += 1
+
+        chunks = rechunk(resample_chunks(audio_chunks(), rate), chunk_size)
+        if to_stdout:
+            if pipe_wav(sys.stdout.buffer, chunks, rate):
+                return "-"
+            print("Error: No audio generated", file=sys.stderr)
+            sys.exit(1)
+
+        output_path.mkdir(parents=True, exist_ok=True)
+        saved = stream_wav(full_path, chunks, rate)
+    else:
+        response = call_with_retries(
+            get_client().models.generate_content,
+            model=model,
+            contents=text,
+            config=build_tts_config(voice, speakers),
+        )
+        all_audio = response_audio(response)
 
-        full_path = output_path / filename
-        save_wav(str(full_path), all_audio)
+        saved = bool(all_audio)
+        if saved:
+            output_path.mkdir(parents=True, exist_ok=True)
+            save_wav(str(full_path), list(resample_chunks([all_audio], rate)), rate)
+
+    if saved:
         print(f"Saved: {full_path}")
+
+        if cached:
+            import shutil
+
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            shutil.copyfile(full_path, tmp)
+            os.replace(tmp, cached)
+
         return str(full_path)
     else:
         print("Error: No audio generated")
         sys.exit(1)
 
 
+async def generate_tts_many(
+    items: list[dict],
+    output_dir: str = "audio/",
+    model: str = "gemini-2.5-flash-preview-tts",
+    use_timestamp: bool = True,
+    rate: int = TTS_RATE,
+) -> list[str | Exception]:
+    """Generate speech for many texts concurrently over one new client.
+
+    A failing item does not stop the others; its exception is returned in
+    place of a path.
+
+    Args:
+        items: Dicts with "text" and optional "voice", "speakers" and
+            "output" (base name; defaults to tts_output_<index>)
+        output_dir: Directory to save audio files
+        model: TTS model ID
+        use_timestamp: Add timestamp to filenames
+        rate: Output sample rate (needs numpy unless 24000)
+
+    Returns:
+        Path to each saved audio file, or the exception that item raised,
+        in item order
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    for item in items:
+        check_voices(item.get("voice", "Kore"), item.get("speakers"))
+
+    async def generate_one(index, item):
+        config = build_tts_config(item.get("voice", "Kore"), item.get("speakers"))
+        async with semaphore:
+            response = await call_with_retries_async(
+                client.aio.models.generate_content,
+                model=model,
+                contents=item["text"],
+                config=config,
+            )
+        audio = response_audio(response)
+        if not audio:
+            raise RuntimeError("No audio generated")
+
+        output_name = item.get("output") or f"tts_output_{index}"
+        full_path = output_file(output_dir, output_name, use_timestamp)
+        segments = await asyncio.to_thread(list, resample_chunks([audio], rate))
+        await asyncio.to_thread(save_wav, str(full_path), segments, rate)
+        print(f"Saved: {full_path}")
+        return str(full_path)
+
+    client = new_client()
+    try:
+        return await asyncio.gather(
+            *(generate_one(index, item) for index, item in enumerate(items)),
+            return_exceptions=True,
+        )
+    finally:
+        await client.aio.aclose()
+        client.close()
+
+
 def parse_speakers(speakers_str: str) -> dict:
-    """Parse speaker string like 'Joe:Kore,Jane:Puck' into dict."""
-    speakers = {}
-    for pair in speakers_str.split(","):
-        if ":" in pair:
-            name, voice = pair.split(":", 1)
-            speakers[name.strip()] = voice.strip()
-    return speakers
+    """Parse speaker string like 'Joe:Kore,Jane Doe:Puck' into dict."""
+    pairs = (pair.partition(":") for pair in speakers_str.split(","))
+    return {name.strip(): voice.strip() for name, sep, voice in pairs if sep}
 
 
 def main():
+    # A bare `tts.py "text"` needs no option parsing, so skip importing and
+    # building the argparse parser
+    if len(sys.argv) == 2 and not sys.argv[1].startswith("-"):
+        try:
+            generate_tts(sys.argv[1])
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Generate speech from text using Gemini TTS"
     )
-    parser.add_argument("text", help="Text to convert to speech")
+    parser.add_argument(
+        "text", nargs="?", help="Text to convert to speech (omit with --batch)"
+    )
     parser.add_argument(
         "--voice",
         "-v",
@@ -200,14 +873,102 @@ def main():
     parser.add_argument(
         "--stream", "-s", action="store_true", help="Use streaming for long text"
     )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Stream the WAV to stdout as it is generated instead of saving a "
+        "file (pipe into aplay or ffplay)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=int,
+        default=TTS_RATE,
+        help="Output sample rate in Hz, e.g. 16000 for speech recognition "
+        "(default: 24000; other rates need numpy)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        metavar="BYTES",
+        help="With --stream or --stdout, write audio in blocks of at least "
+        "this many bytes (default: 0, write each chunk as it arrives)",
+    )
     parser.add_argument(
         "--speakers", help="Multi-speaker mapping: 'Speaker1:Voice1,Speaker2:Voice2'"
     )
+    parser.add_argument(
+        "--parallel-speakers",
+        action="store_true",
+        help="With --speakers, generate each speaker turn as its own request, "
+        "concurrently (faster for long dialogues)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="JSONL file of {text, voice, speakers, output} objects to "
+        "generate concurrently",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the saved audio for an identical earlier request "
+        "(~/.cache/google-studio-skills/)",
+    )
 
     args = parser.parse_args()
 
+    if not args.text and not args.batch:
+        parser.error("text is required unless --batch is given")
+    if args.rate <= 0:
+        parser.error("--rate must be a positive number of Hz")
+
     speakers = parse_speakers(args.speakers) if args.speakers else None
 
+    if args.batch:
+        import asyncio
+        import json
+
+        try:
+            items = []
+            with open(args.batch, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    item.setdefault("voice", args.voice)
+                    item.setdefault("output", f"{args.output}_{len(items)}")
+                    if isinstance(item.get("speakers"), str):
+                        item["speakers"] = parse_speakers(item["speakers"])
+                    else:
+                        item.setdefault("speakers", speakers)
+                    items.append(item)
+
+            results = asyncio.run(
+                generate_tts_many(
+                    items,
+                    output_dir=args.output_dir,
+                    model=args.model,
+                    use_timestamp=not args.no_timestamp,
+                    rate=args.rate,
+                )
+            )
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        failed = [
+            (index, result)
+            for index, result in enumerate(results)
+            if isinstance(result, Exception)
+        ]
+        for index, error in failed:
+            print(f"Error: item {index}: {error}")
+        if failed:
+            print(f"{len(failed)} of {len(results)} items failed")
+            sys.exit(1)
+        return
+
     try:
         generate_tts(
             text=args.text,
@@ -218,9 +979,14 @@ def main():
             stream=args.stream,
             speakers=speakers,
             use_timestamp=not args.no_timestamp,
+            use_cache=args.cache,
+            parallel_speakers=args.parallel_speakers,
+            to_stdout=args.stdout,
+            rate=args.rate,
+            chunk_size=args.chunk_size,
         )
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", file=sys.stderr if args.stdout else sys.stdout)
         sys.exit(1)
 
 